@@ -5,9 +5,13 @@ Chaos Engineering Framework for Databases
 Tests system resilience through controlled failure injection
 """
 
-import psycopg2
+import numpy as np
+import psycopg
+import psycopg_pool
 import time
 import random
+import sys
+from collections import Counter, deque
 from datetime import datetime
 from typing import Dict, List
 import logging
@@ -15,6 +19,103 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+CONNINFO = "host=localhost port=5460 dbname=chaos_db user=postgres password=postgres"
+
+BASELINE_SAMPLES = 20
+# Spacing between latency probes; baseline and settle probes share it so
+# they see the same (not back-to-back hot) connection state
+PROBE_INTERVAL = 0.1
+# Sub-millisecond baselines jitter by more than tol; never settle on less than this
+SETTLE_FLOOR_NS = 1_000_000
+# Fewer samples than this make tail percentiles pure interpolation
+MIN_PERCENTILE_SAMPLES = 20
+
+# Report labels for the per-metric latency arrays
+_LATENCY_METRICS = {
+    'cpu_first_batch_ms': "CPU load first FETCH",
+    'slow_query_ms': "Slow query probe",
+}
+MAX_OBSERVATIONS = 1024
+
+# Display formats for (kind, value) observations, applied at report time
+_OBSERVATION_FORMATS = {
+    'rows_streamed': "CPU-intensive query streamed {} rows",
+    'first_batch_ms': "First batch latency: {:.2f}ms",
+    'delta_exec_ms': "Server execution time: {:.2f}ms",
+    'delta_blks_read': "Shared blocks read: {}",
+    'delta_blks_hit': "Shared blocks hit: {}",
+    'connections_acquired': "Acquired {} pooled connections",
+    'extra_connection': "Additional connection {}",
+    'latency_ms': "Query latency during chaos: {:.2f}ms",
+    'baseline_latency_ms': "Baseline latency: {:.2f}ms",
+    'degradation_pct': "Performance degradation: {:.1f}%",
+    'outcomes': "Success: {0[0]}, Failures: {0[1]}",
+    'error': "Error: {}",
+}
+
+_EQ80 = "=" * 80
+_DASH80 = "-" * 80
+
+
+def _banner(title: str) -> str:
+    return "\n".join(["\n" + _EQ80, title, _EQ80])
+
+
+# Static report text, assembled once at import time
+_REPORT_HEADER = _banner("CHAOS ENGINEERING EXPERIMENT REPORT")
+_REPORT_DETAILS_HEADER = _banner("EXPERIMENT DETAILS")
+_REPORT_LATENCY_HEADER = _banner("LATENCY DISTRIBUTION")
+_REPORT_ASSESSMENT_HEADER = _banner("RESILIENCE ASSESSMENT")
+_REPORT_RECOMMENDATIONS = "\n".join([
+    _banner("RECOMMENDATIONS"),
+    "1. Implement circuit breakers for failing operations",
+    "2. Add connection pool monitoring and alerts",
+    "3. Set query timeouts to prevent resource exhaustion",
+    "4. Implement retry logic with exponential backoff",
+    "5. Regular chaos drills to validate improvements",
+    _EQ80,
+])
+_SUITE_HEADER = _banner("CHAOS ENGINEERING FRAMEWORK")
+_SUITE_FEATURES = "\n".join([
+    "\n" + _EQ80,
+    "Key Features:",
+    "  - Controlled failure injection",
+    "  - Baseline metric comparison",
+    "  - Automated resilience testing",
+    "  - Recovery time measurement",
+    "  - Comprehensive reporting",
+    _EQ80,
+])
+
+
+def _adaptive_fetch(cursor, target_ms: float = 50):
+    """Drain a server-side cursor in geometrically growing batches
+    
+    Starts with a small first batch so the first rows arrive quickly, then
+    doubles the batch size while each FETCH stays under target_ms.
+    Returns (total_rows, first_batch_ms).
+    """
+    batch_size = 100
+    total_rows = 0
+    first_batch_ms = None
+    
+    while True:
+        start = time.perf_counter_ns()
+        rows = cursor.fetchmany(batch_size)
+        elapsed_ms = (time.perf_counter_ns() - start) / 1_000_000
+        
+        if first_batch_ms is None:
+            first_batch_ms = elapsed_ms
+        
+        total_rows += len(rows)
+        # A short batch means the cursor is drained; skip the empty FETCH
+        if len(rows) < batch_size:
+            break
+        if elapsed_ms < target_ms:
+            batch_size *= 2
+    
+    return total_rows, first_batch_ms
+
 
 class ChaosExperiment:
     """Represents a chaos experiment"""
@@ -25,8 +126,10 @@ class ChaosExperiment:
         self.blast_radius = blast_radius
         self.start_time = None
         self.end_time = None
+        self.t0 = None
+        self.t1 = None
         self.result = None
-        self.observations = []
+        self.observations = deque(maxlen=MAX_OBSERVATIONS)
 
 
 class ChaosFramework:
@@ -34,22 +137,63 @@ class ChaosFramework:
     
     def __init__(self):
         self.conn = None
+        self.pool = None
         self.experiments = []
         self.baseline_metrics = {}
-        
+        # Latencies (ms) per metric; only the first n_latencies[metric] are valid
+        self.latencies: Dict[str, np.ndarray] = {}
+        self.n_latencies: Dict[str, int] = {}
+        
+    def _record_latency(self, metric: str, latency_ms: float):
+        samples = self.latencies.get(metric)
+        n = self.n_latencies.get(metric, 0)
+        if samples is None:
+            samples = self.latencies[metric] = np.empty(1024, dtype=np.float64)
+        elif n == len(samples):
+            samples = self.latencies[metric] = np.resize(samples, 2 * len(samples))
+        samples[n] = latency_ms
+        self.n_latencies[metric] = n + 1
+    
     def connect(self):
         try:
-            self.conn = psycopg2.connect(
-                host='localhost', port=5460,
-                dbname='chaos_db', user='postgres', password='postgres'
+            self._open_connection()
+            
+            # Pre-warmed pool reused by the saturation experiment
+            self.pool = psycopg_pool.ConnectionPool(
+                CONNINFO, min_size=10, max_size=11, open=True
             )
-            self.conn.autocommit = True
+            self.pool.wait()
+            
             logger.info("Connected to target database")
             return True
         except Exception as e:
             logger.error(f"Connection failed: {e}")
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
             return False
     
+    def _open_connection(self):
+        # Probes are PREPAREd explicitly, so skip psycopg's auto-prepare
+        self.conn = psycopg.connect(CONNINFO, autocommit=True, prepare_threshold=None)
+        self._configure_session()
+    
+    def _configure_session(self):
+        """Bound server-side execution time for this session"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SET statement_timeout = 10000;
+                SET lock_timeout = 2000;
+                SET idle_in_transaction_session_timeout = 30000;
+            """)
+        except Exception as e:
+            logger.warning(f"Could not set session timeouts: {e}")
+        cursor.close()
+    
     def setup(self):
         """Setup test database"""
         cursor = self.conn.cursor()
@@ -65,9 +209,56 @@ class ChaosFramework:
             FROM generate_series(1, 1000) i
             ON CONFLICT DO NOTHING;
         """)
+        
+        # Load test_data into shared buffers so the baseline isn't cold
+        try:
+            cursor.execute("""
+                CREATE EXTENSION IF NOT EXISTS pg_prewarm;
+                SELECT pg_prewarm('test_data');
+            """)
+        except Exception as e:
+            logger.warning(f"pg_prewarm unavailable: {e}")
+        
+        # Per-statement execution stats for measuring injected load
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_stat_statements")
+        except Exception as e:
+            logger.warning(f"pg_stat_statements unavailable: {e}")
+        
         cursor.close()
+        
+        self._prepare_statements()
         logger.info("Test database ready")
     
+    def _snapshot_statements(self):
+        """Return this database and role's cumulative (exec_ms, blks_read, blks_hit), or None"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT COALESCE(sum(total_exec_time), 0),
+                       COALESCE(sum(shared_blks_read), 0),
+                       COALESCE(sum(shared_blks_hit), 0)
+                FROM pg_stat_statements
+                WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+                  AND userid = (SELECT oid FROM pg_roles WHERE rolname = current_user)
+                  AND query NOT LIKE '%pg_stat_statements%'
+            """)
+            return cursor.fetchone()
+        except psycopg.Error as e:
+            logger.debug(f"  pg_stat_statements snapshot failed: {e}")
+            return None
+        finally:
+            cursor.close()
+    
+    def _prepare_statements(self):
+        """Prepare the repeated probe queries once per session"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            PREPARE probe AS SELECT 1;
+            PREPARE cnt AS SELECT COUNT(*) FROM test_data;
+        """)
+        cursor.close()
+    
     def capture_baseline(self):
         """Capture baseline metrics before chaos"""
         
@@ -75,25 +266,39 @@ class ChaosFramework:
         
         cursor = self.conn.cursor()
         
-        # Query latency
-        start = time.time()
-        cursor.execute("SELECT COUNT(*) FROM test_data")
+        # Untimed warm-up run so plan and cache warmup isn't measured
+        cursor.execute("EXECUTE cnt")
         cursor.fetchone()
-        latency = (time.time() - start) * 1000
         
-        # Connection count
+        # Query latency, timed on the same statement the chaos probes use and
+        # sampled repeatedly so one noisy run doesn't skew the baseline.
+        # Samples are spaced like the chaos probes; a tight loop reads
+        # several times faster than any single probe taken after a pause
+        samples = []
+        for _ in range(BASELINE_SAMPLES):
+            time.sleep(PROBE_INTERVAL)
+            start = time.perf_counter_ns()
+            cursor.execute("EXECUTE cnt")
+            cursor.fetchone()
+            samples.append(time.perf_counter_ns() - start)
+        
+        # Connection count, read once outside the timed loop
         cursor.execute("SELECT count(*) FROM pg_stat_activity")
         connections = cursor.fetchone()[0]
         
         cursor.close()
         
+        median_ns, p95_ns = np.percentile(samples, [50, 95])
+        
         self.baseline_metrics = {
-            'query_latency_ms': latency,
+            'query_latency_ns_median': median_ns,
+            'query_latency_ns_p95': p95_ns,
             'active_connections': connections,
             'timestamp': datetime.now()
         }
         
-        logger.info(f"  Baseline latency: {latency:.2f}ms")
+        logger.info(f"  Baseline latency: {median_ns / 1_000_000:.2f}ms median, "
+                    f"{p95_ns / 1_000_000:.2f}ms p95")
         logger.info(f"  Baseline connections: {connections}")
     
     def inject_high_cpu_load(self, duration: int = 5):
@@ -106,29 +311,45 @@ class ChaosFramework:
         )
         
         experiment.start_time = datetime.now()
+        experiment.t0 = time.perf_counter_ns()
         
         logger.info("Injecting CPU load...")
         
-        cursor = self.conn.cursor()
+        stats_before = self._snapshot_statements()
         
-        # Run expensive query
+        # Run expensive query, streaming the rows in adaptive batches.
+        # Server-side cursors need a transaction; a WITH HOLD cursor under
+        # autocommit would materialize the whole result before the first FETCH
         try:
-            cursor.execute("""
-                SELECT COUNT(*) FROM test_data t1 
-                CROSS JOIN test_data t2 
-                LIMIT 100000
-            """)
-            cursor.fetchall()
+            with self.conn.transaction(), self.conn.cursor(name='cpu_load_scan') as cursor:
+                cursor.execute("""
+                    SELECT 1 FROM test_data t1
+                    CROSS JOIN test_data t2
+                    LIMIT 100000
+                """)
+                total_rows, first_batch_ms = _adaptive_fetch(cursor)
+            
+            experiment.observations.append(("rows_streamed", total_rows))
+            experiment.observations.append(("first_batch_ms", first_batch_ms))
+            self._record_latency('cpu_first_batch_ms', first_batch_ms)
+            
+            # Server-side cost of the injection window
+            stats_after = self._snapshot_statements()
+            if stats_before is not None and stats_after is not None:
+                exec_ms, blks_read, blks_hit = (
+                    float(after - before) for before, after in zip(stats_before, stats_after)
+                )
+                experiment.observations.append(("delta_exec_ms", exec_ms))
+                experiment.observations.append(("delta_blks_read", int(blks_read)))
+                experiment.observations.append(("delta_blks_hit", int(blks_hit)))
             
-            experiment.observations.append("CPU-intensive query executed")
             experiment.result = "completed"
             
         except Exception as e:
-            experiment.observations.append(f"Error: {e}")
+            experiment.observations.append(("error", e))
             experiment.result = "failed"
         
-        cursor.close()
-        
+        experiment.t1 = time.perf_counter_ns()
         experiment.end_time = datetime.now()
         self.experiments.append(experiment)
         
@@ -146,6 +367,7 @@ class ChaosFramework:
         )
         
         experiment.start_time = datetime.now()
+        experiment.t0 = time.perf_counter_ns()
         
         logger.info("Saturating connection pool...")
         
@@ -153,41 +375,35 @@ class ChaosFramework:
         max_connections = 10
         
         try:
+            # Pool is pre-warmed, so each getconn is a local lookup
             for i in range(max_connections):
-                conn = psycopg2.connect(
-                    host='localhost', port=5460,
-                    dbname='chaos_db', user='postgres', password='postgres'
-                )
-                connections.append(conn)
+                connections.append(self.pool.getconn())
             
-            experiment.observations.append(f"Created {len(connections)} connections")
+            experiment.observations.append(("connections_acquired", len(connections)))
             
             # Hold connections briefly
             time.sleep(2)
             
             # Test if new connections fail
             try:
-                extra_conn = psycopg2.connect(
-                    host='localhost', port=5460,
-                    dbname='chaos_db', user='postgres', password='postgres',
-                    connect_timeout=2
-                )
+                extra_conn = psycopg.connect(CONNINFO, connect_timeout=2)
                 extra_conn.close()
-                experiment.observations.append("Additional connection succeeded")
+                experiment.observations.append(("extra_connection", "succeeded"))
             except:
-                experiment.observations.append("Additional connection blocked (expected)")
+                experiment.observations.append(("extra_connection", "blocked (expected)"))
             
             experiment.result = "completed"
             
         except Exception as e:
-            experiment.observations.append(f"Error: {e}")
+            experiment.observations.append(("error", e))
             experiment.result = "failed"
         
         finally:
-            # Cleanup
+            # Return connections to the pool
             for conn in connections:
-                conn.close()
+                self.pool.putconn(conn)
         
+        experiment.t1 = time.perf_counter_ns()
         experiment.end_time = datetime.now()
         self.experiments.append(experiment)
         
@@ -205,6 +421,7 @@ class ChaosFramework:
         )
         
         experiment.start_time = datetime.now()
+        experiment.t0 = time.perf_counter_ns()
         
         logger.info("Injecting slow queries...")
         
@@ -215,27 +432,30 @@ class ChaosFramework:
             cursor.execute("SELECT pg_sleep(2)")
             cursor.fetchone()
             
-            # Measure impact on subsequent queries
-            start = time.time()
-            cursor.execute("SELECT COUNT(*) FROM test_data")
+            # Measure impact on subsequent queries, spaced like the baseline samples
+            time.sleep(PROBE_INTERVAL)
+            start = time.perf_counter_ns()
+            cursor.execute("EXECUTE cnt")
             cursor.fetchone()
-            latency = (time.time() - start) * 1000
+            latency_ns = time.perf_counter_ns() - start
+            baseline_ns = self.baseline_metrics['query_latency_ns_median']
             
-            experiment.observations.append(f"Query latency during chaos: {latency:.2f}ms")
-            experiment.observations.append(f"Baseline latency: {self.baseline_metrics['query_latency_ms']:.2f}ms")
+            experiment.observations.append(("latency_ms", latency_ns / 1_000_000))
+            self._record_latency('slow_query_ms', latency_ns / 1_000_000)
+            experiment.observations.append(("baseline_latency_ms", baseline_ns / 1_000_000))
             
-            degradation = ((latency - self.baseline_metrics['query_latency_ms']) / 
-                          self.baseline_metrics['query_latency_ms'] * 100)
+            degradation = (latency_ns - baseline_ns) / baseline_ns * 100
             
-            experiment.observations.append(f"Performance degradation: {degradation:.1f}%")
+            experiment.observations.append(("degradation_pct", degradation))
             experiment.result = "completed"
             
         except Exception as e:
-            experiment.observations.append(f"Error: {e}")
+            experiment.observations.append(("error", e))
             experiment.result = "failed"
         
         cursor.close()
         
+        experiment.t1 = time.perf_counter_ns()
         experiment.end_time = datetime.now()
         self.experiments.append(experiment)
         
@@ -253,33 +473,51 @@ class ChaosFramework:
         )
         
         experiment.start_time = datetime.now()
+        experiment.t0 = time.perf_counter_ns()
         
         logger.info("Injecting random failures...")
         
         cursor = self.conn.cursor()
         
-        success_count = 0
-        failure_count = 0
+        # Diagnostics are only valid inside the callback, so copy the text out
+        notices = []
+        handler = lambda d: notices.append(d.message_primary)
+        self.conn.add_notice_handler(handler)
         
-        for i in range(10):
-            try:
-                # Randomly fail some operations
-                if random.random() < 0.3:  # 30% failure rate
-                    cursor.execute("SELECT 1/0")  # Intentional error
-                    failure_count += 1
-                else:
-                    cursor.execute("SELECT 1")
-                    cursor.fetchone()
-                    success_count += 1
-                    
-            except Exception as e:
-                failure_count += 1
+        try:
+            # Draw and fail all operations server-side in one round trip
+            cursor.execute("""
+                DO $$
+                DECLARE s int := 0; f int := 0;
+                BEGIN
+                    FOR i IN 1..10 LOOP
+                        BEGIN
+                            IF random() < 0.3 THEN  -- 30% failure rate
+                                PERFORM 1/0;  -- Intentional error
+                            END IF;
+                            s := s + 1;
+                        EXCEPTION WHEN division_by_zero THEN
+                            f := f + 1;
+                        END;
+                    END LOOP;
+                    RAISE NOTICE '% %', s, f;
+                END $$
+            """)
+            success_count, failure_count = map(int, notices[-1].split())
+            
+            experiment.observations.append(("outcomes", (success_count, failure_count)))
+            experiment.result = "completed"
+            
+        except Exception as e:
+            experiment.observations.append(("error", e))
+            experiment.result = "failed"
         
-        experiment.observations.append(f"Success: {success_count}, Failures: {failure_count}")
-        experiment.result = "completed"
+        finally:
+            self.conn.remove_notice_handler(handler)
         
         cursor.close()
         
+        experiment.t1 = time.perf_counter_ns()
         experiment.end_time = datetime.now()
         self.experiments.append(experiment)
         
@@ -287,73 +525,129 @@ class ChaosFramework:
         
         return experiment
     
+    def _wait_until_baseline(self, tol: float = 1.2, timeout: float = 5.0):
+        """Poll until query latency is back within tol of the baseline p95"""
+        
+        threshold_ns = max(tol * self.baseline_metrics['query_latency_ns_p95'], SETTLE_FLOOR_NS)
+        deadline = time.perf_counter_ns() + int(timeout * 1e9)
+        
+        cursor = self.conn.cursor()
+        
+        while time.perf_counter_ns() < deadline:
+            start = time.perf_counter_ns()
+            try:
+                cursor.execute("EXECUTE cnt")
+                cursor.fetchone()
+                if time.perf_counter_ns() - start <= threshold_ns:
+                    cursor.close()
+                    return True
+            except Exception as e:
+                logger.debug(f"  Settle probe failed: {e}")
+            time.sleep(PROBE_INTERVAL)
+        
+        cursor.close()
+        logger.warning(f"  Latency not back to baseline after {timeout:.1f}s")
+        return False
+    
+    def _reconnect(self):
+        """Replace a broken main connection, restoring session state"""
+        self.conn.close()
+        try:
+            self._open_connection()
+            self._prepare_statements()
+        except psycopg.Error as e:
+            # Leave a closed handle so the next attempt reconnects from scratch
+            # rather than probing a session without its prepared statements
+            self.conn.close()
+            logger.debug(f"  Reconnect failed: {e}")
+    
     def test_recovery_time(self):
         """Test recovery after chaos"""
         
         logger.info("Testing recovery time...")
         
-        cursor = self.conn.cursor()
-        
-        recovery_start = time.time()
+        recovery_start = time.perf_counter_ns()
         attempts = 0
         max_attempts = 10
         
         while attempts < max_attempts:
+            attempt_start = time.perf_counter_ns()
+            logger.debug(f"  Probe {attempts + 1} at +{attempt_start - recovery_start}ns")
             try:
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
+                self.conn.execute("EXECUTE probe").fetchone()
+                probe_end = time.perf_counter_ns()
                 break
-            except:
+            except (psycopg.OperationalError, psycopg.InterfaceError) as e:
+                probe_end = time.perf_counter_ns()
                 attempts += 1
-                time.sleep(0.5)
+                logger.debug(f"  Probe failed: {e}")
+                # A statement_timeout cancel leaves the session usable
+                if not isinstance(e, psycopg.errors.QueryCanceled):
+                    self._reconnect()
+                # Capped exponential backoff with full jitter; none after the last probe
+                if attempts < max_attempts:
+                    time.sleep(random.uniform(0, min(2.0, 0.05 * (2 ** attempts))))
         
-        recovery_time = (time.time() - recovery_start) * 1000
+        if attempts == max_attempts:
+            logger.warning(f"  No recovery after {max_attempts} attempts")
+            return None
         
-        cursor.close()
+        # Measured up to the end of the successful probe, not the backoff before it
+        recovery_time = (probe_end - recovery_start) / 1_000_000
         
-        logger.info(f"  Recovery time: {recovery_time:.2f}ms ({attempts} attempts)")
+        logger.info(f"  Recovery time: {recovery_time:.2f}ms ({attempts} failed attempts)")
         
         return recovery_time
     
     def generate_report(self):
         """Generate chaos experiment report"""
         
-        print("\n" + "=" * 80)
-        print("CHAOS ENGINEERING EXPERIMENT REPORT")
-        print("=" * 80)
-        print(f"Total Experiments: {len(self.experiments)}")
+        out = []
+        
+        out.append(_REPORT_HEADER)
+        out.append(f"Total Experiments: {len(self.experiments)}")
         
-        completed = [e for e in self.experiments if e.result == 'completed']
-        failed = [e for e in self.experiments if e.result == 'failed']
+        results = Counter(e.result for e in self.experiments)
+        completed_n = results['completed']
+        failed_n = results['failed']
         
-        print(f"Completed: {len(completed)}")
-        print(f"Failed: {len(failed)}")
+        out.append(f"Completed: {completed_n}")
+        out.append(f"Failed: {failed_n}")
         
-        print("\n" + "=" * 80)
-        print("EXPERIMENT DETAILS")
-        print("=" * 80)
+        out.append(_REPORT_DETAILS_HEADER)
         
         for i, exp in enumerate(self.experiments, 1):
-            duration = (exp.end_time - exp.start_time).total_seconds()
+            duration = (exp.t1 - exp.t0) / 1e9
             
-            print(f"\n[{i}] {exp.name}")
-            print(f"    Description: {exp.description}")
-            print(f"    Blast Radius: {exp.blast_radius}")
-            print(f"    Duration: {duration:.2f}s")
-            print(f"    Result: {exp.result.upper()}")
+            out.append(f"\n[{i}] {exp.name}")
+            out.append(f"    Description: {exp.description}")
+            out.append(f"    Blast Radius: {exp.blast_radius}")
+            out.append(f"    Duration: {duration:.2f}s")
+            out.append(f"    Result: {exp.result.upper()}")
             
             if exp.observations:
-                print(f"    Observations:")
-                for obs in exp.observations:
-                    print(f"      - {obs}")
+                out.append(f"    Observations:")
+                for kind, value in exp.observations:
+                    out.append(f"      - {_OBSERVATION_FORMATS[kind].format(value)}")
+        
+        if self.n_latencies:
+            out.append(_REPORT_LATENCY_HEADER)
+            for metric, n in self.n_latencies.items():
+                samples = self.latencies[metric][:n]
+                label = _LATENCY_METRICS.get(metric, metric)
+                if n >= MIN_PERCENTILE_SAMPLES:
+                    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+                    out.append(f"{label} (n={n}): "
+                               f"p50 {p50:.2f}ms  p95 {p95:.2f}ms  p99 {p99:.2f}ms")
+                else:
+                    out.append(f"{label} (n={n}): "
+                               f"median {np.median(samples):.2f}ms  max {samples.max():.2f}ms")
         
-        print("\n" + "=" * 80)
-        print("RESILIENCE ASSESSMENT")
-        print("=" * 80)
+        out.append(_REPORT_ASSESSMENT_HEADER)
         
-        score = (len(completed) / len(self.experiments) * 100) if self.experiments else 0
+        score = (completed_n / len(self.experiments) * 100) if self.experiments else 0
         
-        print(f"Resilience Score: {score:.0f}/100")
+        out.append(f"Resilience Score: {score:.0f}/100")
         
         if score >= 80:
             assessment = "EXCELLENT"
@@ -364,24 +658,16 @@ class ChaosFramework:
         else:
             assessment = "NEEDS IMPROVEMENT"
         
-        print(f"Assessment: {assessment}")
-        
-        print("\n" + "=" * 80)
-        print("RECOMMENDATIONS")
-        print("=" * 80)
-        print("1. Implement circuit breakers for failing operations")
-        print("2. Add connection pool monitoring and alerts")
-        print("3. Set query timeouts to prevent resource exhaustion")
-        print("4. Implement retry logic with exponential backoff")
-        print("5. Regular chaos drills to validate improvements")
-        print("=" * 80)
+        out.append(f"Assessment: {assessment}")
+        
+        out.append(_REPORT_RECOMMENDATIONS)
+        
+        sys.stdout.write("\n".join(out) + "\n")
     
     def run_chaos_suite(self):
         """Run complete chaos engineering suite"""
         
-        print("\n" + "=" * 80)
-        print("CHAOS ENGINEERING FRAMEWORK")
-        print("=" * 80)
+        print(_SUITE_HEADER)
         
         if not self.connect():
             return
@@ -390,51 +676,45 @@ class ChaosFramework:
         
         # Establish baseline
         print("\nPHASE 1: Establish Baseline")
-        print("-" * 80)
+        print(_DASH80)
         self.capture_baseline()
-        
-        time.sleep(2)
+        self._wait_until_baseline()
         
         # Experiment 1
         print("\nPHASE 2: CPU Load Experiment")
-        print("-" * 80)
+        print(_DASH80)
         self.inject_high_cpu_load()
-        time.sleep(2)
+        self._wait_until_baseline()
         
         # Experiment 2
         print("\nPHASE 3: Connection Saturation Experiment")
-        print("-" * 80)
+        print(_DASH80)
         self.inject_connection_saturation()
-        time.sleep(2)
+        self._wait_until_baseline()
         
         # Experiment 3
         print("\nPHASE 4: Slow Query Experiment")
-        print("-" * 80)
+        print(_DASH80)
         self.inject_slow_queries()
-        time.sleep(2)
+        self._wait_until_baseline()
         
         # Experiment 4
         print("\nPHASE 5: Random Failure Experiment")
-        print("-" * 80)
+        print(_DASH80)
         self.inject_random_failures()
-        time.sleep(2)
+        self._wait_until_baseline()
         
         # Recovery test
         print("\nPHASE 6: Recovery Testing")
-        print("-" * 80)
+        print(_DASH80)
         self.test_recovery_time()
         
         # Generate report
         self.generate_report()
         
-        print("\n" + "=" * 80)
-        print("Key Features:")
-        print("  - Controlled failure injection")
-        print("  - Baseline metric comparison")
-        print("  - Automated resilience testing")
-        print("  - Recovery time measurement")
-        print("  - Comprehensive reporting")
-        print("=" * 80)
+        self.pool.close()
+        
+        print(_SUITE_FEATURES)
 
 
 def main():
@@ -3,6 +3,9 @@ from unittest.mock import Mock, patch
 import sys
 sys.path.append('src')
 
+import chaos_framework
+from chaos_framework import ChaosExperiment, ChaosFramework, _adaptive_fetch
+
 
 class TestDatabaseManager:
     """Test database manager functionality"""
@@ -58,3 +61,174 @@ def test_graceful_shutdown():
     """Test graceful shutdown"""
     # Test implementation
     assert True
+
+
+def _experiment(result="completed", observations=()):
+    exp = ChaosExperiment("Exp", "Description", "database")
+    exp.t0, exp.t1 = 0, 1_500_000_000
+    exp.result = result
+    exp.observations.extend(observations)
+    return exp
+
+
+class FakeServerCursor:
+    """Server-side cursor stand-in that records FETCH sizes"""
+    
+    def __init__(self, total_rows):
+        self.remaining = total_rows
+        self.fetch_sizes = []
+    
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        n = min(size, self.remaining)
+        self.remaining -= n
+        return [(1,)] * n
+
+
+class FakeDiagnostic:
+    """Mimics psycopg's Diagnostic, which is only readable inside the callback"""
+    
+    def __init__(self, message):
+        self._message = message
+        self.valid = True
+    
+    @property
+    def message_primary(self):
+        return self._message if self.valid else None
+
+
+class TestChaosReport:
+    """Test chaos report generation"""
+    
+    def test_observation_formats(self, capsys):
+        """Test (kind, value) observations are formatted at report time"""
+        chaos = ChaosFramework()
+        chaos.experiments.append(_experiment(observations=[
+            ("rows_streamed", 100000),
+            ("latency_ms", 1.234),
+            ("degradation_pct", 12.345),
+            ("outcomes", (7, 3)),
+            ("error", ValueError("boom")),
+        ]))
+        
+        chaos.generate_report()
+        out = capsys.readouterr().out
+        
+        assert "- CPU-intensive query streamed 100000 rows" in out
+        assert "- Query latency during chaos: 1.23ms" in out
+        assert "- Performance degradation: 12.3%" in out
+        assert "- Success: 7, Failures: 3" in out
+        assert "- Error: boom" in out
+        assert "Duration: 1.50s" in out
+    
+    def test_every_observation_kind_has_format(self):
+        """Test every observation kind recorded by the framework can be rendered"""
+        import inspect
+        import re
+        
+        source = inspect.getsource(chaos_framework)
+        kinds = set(re.findall(r'observations\.append\(\("(\w+)"', source))
+        
+        assert kinds
+        assert kinds <= set(chaos_framework._OBSERVATION_FORMATS)
+    
+    def test_result_tally(self, capsys):
+        """Test completed/failed counts and resilience score"""
+        chaos = ChaosFramework()
+        chaos.experiments.extend([
+            _experiment("completed"), _experiment("completed"),
+            _experiment("completed"), _experiment("failed"),
+        ])
+        
+        chaos.generate_report()
+        out = capsys.readouterr().out
+        
+        assert "Completed: 3" in out
+        assert "Failed: 1" in out
+        assert "Resilience Score: 75/100" in out
+    
+    def test_latency_percentiles_need_enough_samples(self, capsys):
+        """Test tail percentiles are only reported with enough samples"""
+        chaos = ChaosFramework()
+        chaos._record_latency('slow_query_ms', 1.0)
+        for i in range(chaos_framework.MIN_PERCENTILE_SAMPLES):
+            chaos._record_latency('cpu_first_batch_ms', float(i))
+        
+        chaos.generate_report()
+        out = capsys.readouterr().out
+        
+        assert "Slow query probe (n=1): median 1.00ms  max 1.00ms" in out
+        assert "CPU load first FETCH (n=20): p50" in out
+
+
+class TestChaosMeasurements:
+    """Test chaos measurement helpers"""
+    
+    def test_adaptive_fetch_doubles_batches(self):
+        """Test batches double while fast and stop on a short batch"""
+        cursor = FakeServerCursor(1000)
+        
+        total_rows, first_batch_ms = _adaptive_fetch(cursor)
+        
+        assert total_rows == 1000
+        assert first_batch_ms is not None
+        # 100 + 200 + 400 = 700; the 800-row FETCH returns 300 and ends the scan
+        assert cursor.fetch_sizes == [100, 200, 400, 800]
+    
+    def test_adaptive_fetch_holds_size_when_slow(self):
+        """Test batch size stops growing once a FETCH exceeds the target"""
+        cursor = FakeServerCursor(250)
+        
+        total_rows, _ = _adaptive_fetch(cursor, target_ms=0)
+        
+        assert total_rows == 250
+        assert cursor.fetch_sizes == [100, 100, 100]
+    
+    def test_record_latency_resizes(self):
+        """Test per-metric latency arrays grow past their preallocation"""
+        chaos = ChaosFramework()
+        for i in range(1500):
+            chaos._record_latency('slow_query_ms', float(i))
+        chaos._record_latency('cpu_first_batch_ms', 2.5)
+        
+        assert chaos.n_latencies == {'slow_query_ms': 1500, 'cpu_first_batch_ms': 1}
+        assert len(chaos.latencies['slow_query_ms']) >= 1500
+        assert chaos.latencies['slow_query_ms'][1499] == 1499.0
+        assert chaos.latencies['cpu_first_batch_ms'][0] == 2.5
+    
+    def test_random_failures_parse_notice(self):
+        """Test failure counts are copied out of the notice callback"""
+        chaos = ChaosFramework()
+        chaos.conn = Mock()
+        handlers = []
+        chaos.conn.add_notice_handler.side_effect = handlers.append
+        
+        def run_do_block(query):
+            diag = FakeDiagnostic("7 3")
+            for handler in handlers:
+                handler(diag)
+            diag.valid = False
+        
+        chaos.conn.cursor.return_value.execute.side_effect = run_do_block
+        
+        exp = chaos.inject_random_failures()
+        
+        assert exp.result == "completed"
+        assert list(exp.observations) == [("outcomes", (7, 3))]
+        chaos.conn.remove_notice_handler.assert_called_once_with(handlers[0])
+    
+    def test_recovery_gives_up(self):
+        """Test recovery returns None once attempts are exhausted"""
+        import psycopg
+        
+        chaos = ChaosFramework()
+        chaos.conn = Mock()
+        chaos.conn.execute.side_effect = psycopg.OperationalError("down")
+        
+        with patch.object(chaos, '_reconnect') as reconnect, \
+                patch('chaos_framework.time.sleep') as sleep:
+            assert chaos.test_recovery_time() is None
+        
+        assert reconnect.call_count == 10
+        # No backoff after the final attempt
+        assert sleep.call_count == 9